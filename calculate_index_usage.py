@@ -1,13 +1,53 @@
 #!/usr/bin/env python3
 
 import json
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib parser
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, fall back to loading the whole file
+    ijson = None
+
+
+# Elasticsearch node roles that hold data and are therefore billed for
+DATA_ROLES = frozenset({'data', 'data_content', 'data_hot', 'data_warm', 'data_cold', 'data_frozen'})
+
+GB_PER_BYTE = 1.0 / (1024 ** 3)  # 1024^3 = 1,073,741,824 bytes per GB
+HOURS_PER_YEAR = 8760.0
+
 
 def bytes_to_gb(bytes_value):
-    return bytes_value / (1024 ** 3)  # 1024^3 = 1,073,741,824
+    return bytes_value * GB_PER_BYTE
+
+def load_json_file(json_file):
+    # orjson parses bytes directly and is considerably faster on large diagnostics
+    with open(json_file, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def write_csv_file(df, csv_file):
+    # The Arrow CSV writer is multithreaded C++ and much faster than pandas on wide frames
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(csv_file))
+
+def iter_json_indices(json_file):
+    # Yield (index name, index object) pairs from the top-level 'indices' object,
+    # streaming with ijson so multi-GB stats dumps are never fully resident
+    if ijson is None:
+        yield from load_json_file(json_file).get('indices', {}).items()
+        return
+
+    with open(json_file, 'rb') as f:
+        yield from ijson.kvitems(f, 'indices', use_float=True)
 
 def process_elastic_pricing( pricing_file ):
     pricing_data = []
@@ -46,38 +86,59 @@ def process_elastic_pricing( pricing_file ):
 
 def process_elasticsearch_nodes_data( nodes_stats_file ):
 
-    node_data = []
     try:
-        with open(nodes_stats_file, 'r') as f:
-            nodes_stat = json.load(f)
+        nodes_stat = load_json_file(nodes_stats_file)
     
         nodes = nodes_stat.get("nodes", {})         
 
+        # Pick out only the fields we need from each node document; nodes_stats carries thousands
+        # of leaves per node (jvm, thread_pool, breakers, ...) that are never used here
+        node_records = []
 
         for node_id, node_info in nodes.items():
-            node_name = node_info.get("name", "No host information")
-            node_roles = node_info.get("roles")
-            node_mem = bytes_to_gb(node_info.get('os', {}).get('mem', {}).get('total_in_bytes'))
-            node_diskspace = bytes_to_gb(node_info.get('fs', {}).get('total', {}).get('total_in_bytes'))
-            node_total_data_size = bytes_to_gb(node_info.get('indices', {}).get('store', {}).get('total_data_set_size_in_bytes'))
-            node_freespace = node_diskspace - node_total_data_size
-            region = node_info.get('attributes', {}).get('region')
-            product = node_info.get('attributes',{}).get("instance_configuration", "No instance configuration")
-            availability_zone = node_info.get('attributes',{}).get('availability_zone', "No availability zone")
-            node_type = node_info.get('attributes',{}).get('data', 'No node type available')
-
-            node_data.append({
-                'id': node_id,
-                'node': node_name,
-                'roles': node_roles,
-                'region_code': region,
-                'node_type': node_type,
-                'product': product,
-                'memory (GB)': node_mem,
-                "disk space (GB)": round(node_diskspace,2),
-                "data store size (GB)": round(node_total_data_size,2),
-                "free space (GB)": round(node_freespace,2)
-            })
+            attributes = node_info.get('attributes', {})
+            node_records.append((
+                node_id,
+                node_info.get("name", "No host information"),
+                node_info.get("roles"),
+                node_info.get('os', {}).get('mem', {}).get('total_in_bytes', np.nan),
+                node_info.get('fs', {}).get('total', {}).get('total_in_bytes', np.nan),
+                node_info.get('indices', {}).get('store', {}).get('total_data_set_size_in_bytes', np.nan),
+                attributes.get('region'),
+                attributes.get("instance_configuration", "No instance configuration"),
+                attributes.get('availability_zone', "No availability zone"),
+                attributes.get('data', 'No node type available')
+            ))
+
+        nodes_df = pd.DataFrame.from_records(node_records, columns=[
+            'id',
+            'name',
+            'roles',
+            'mem_bytes',
+            'disk_bytes',
+            'data_set_bytes',
+            'region',
+            'instance_configuration',
+            'availability_zone',
+            'data'
+        ])
+
+        node_diskspace = bytes_to_gb(pd.to_numeric(nodes_df['disk_bytes']))
+        node_total_data_size = bytes_to_gb(pd.to_numeric(nodes_df['data_set_bytes']))
+        node_freespace = node_diskspace - node_total_data_size
+
+        node_data = pd.DataFrame({
+            'id': nodes_df['id'],
+            'node': nodes_df['name'],
+            'roles': nodes_df['roles'],
+            'region_code': nodes_df['region'],
+            'node_type': nodes_df['data'],
+            'product': nodes_df['instance_configuration'],
+            'memory (GB)': bytes_to_gb(pd.to_numeric(nodes_df['mem_bytes'])),
+            "disk space (GB)": node_diskspace.round(2),
+            "data store size (GB)": node_total_data_size.round(2),
+            "free space (GB)": node_freespace.round(2)
+        })
 
     except FileNotFoundError as e:
         print(f"Error: Could not find file - {e}")
@@ -89,14 +150,13 @@ def process_elasticsearch_nodes_data( nodes_stats_file ):
         print(f"Error: {e}")
         sys.exit(1)
 
-    return pd.DataFrame(node_data)
+    return node_data
 
 
 def process_elasticsearch_index_data(indices_stats_file, indices_file, nodes_file, ilm_explain_file):
 
     try:
-        with open(indices_file, 'r') as f:
-            indices_data = json.load(f)
+        indices_data = load_json_file(indices_file)
         
 
         indices_df = pd.DataFrame(indices_data)
@@ -105,85 +165,59 @@ def process_elasticsearch_index_data(indices_stats_file, indices_file, nodes_fil
         indices_df = indices_df[~indices_df['index'].str.startswith('.')]
         
         # Add a data_type column based on prirep value
-        indices_df['data_type'] = indices_df['prirep'].apply(lambda x: 'primary' if x == 'p' else 'replica')
+        indices_df['data_type'] = np.where(indices_df['prirep'].to_numpy() == 'p', 'primary', 'replica')
         
 
-        with open(nodes_file, 'r') as f:
-            nodes_data = json.load(f)
-        
-        # Create a list to store node information
-        nodes_list = []
-        
-        for node_id, node_info in nodes_data['nodes'].items():
-            node_attrs = node_info.get('attributes', {})
-            nodes_list.append({
-                'id': node_id,
-                'node_type': node_attrs.get('data', 'unknown'),
-                'instance_configuration': node_attrs.get('instance_configuration', 'unknown')
-            })
-        
-        # Create DataFrame from the nodes list
-        nodes_df = pd.DataFrame(nodes_list)
+        nodes_data = load_json_file(nodes_file)
         
-        # Process indices_stats.json - extract size information
-        with open(indices_stats_file, 'r') as f:
-            indices_stats_data = json.load(f)
+        # Build a DataFrame of the node attributes we need keyed by node ID
+        nodes_df = pd.DataFrame.from_records(
+            [
+                (
+                    node_id,
+                    node_info.get('attributes', {}).get('data', 'unknown'),
+                    node_info.get('attributes', {}).get('instance_configuration', 'unknown')
+                )
+                for node_id, node_info in nodes_data['nodes'].items()
+            ],
+            columns=['id', 'node_type', 'instance_configuration']
+        )
         
-        # Create lists to store primary and replica size information
-        primary_sizes = []
-        replica_sizes = []
+        # Process indices_stats.json - extract primary size per index and replica sizes
+        # from shards, streaming one index at a time
+        sizes_records = []
         
-        for index_name, index_stats in indices_stats_data['indices'].items():
-            if not index_name.startswith('.'):  # Skip system indices
-                # Get primary size
-                primary_size = index_stats.get('primaries', {}).get('store', {}).get('size_in_bytes', 'unknown')
-                primary_sizes.append({
-                    'index': index_name,
-                    'data_type': 'primary',
-                    'size': primary_size
-                })
-                
-                # Get replica sizes from shards
-                shards = index_stats.get('shards', {})
-                for shard_id, shard_list in shards.items():
-                    for shard in shard_list:
-                        if shard.get('routing', {}).get('primary', True) == False:
-                            replica_size = shard.get('store', {}).get('size_in_bytes', 'unknown')
-                            replica_sizes.append({
-                                'index': index_name,
-                                'shard': shard_id,
-                                'data_type': 'replica',
-                                'size': replica_size
-                            })
+        for index_name, index_stats in iter_json_indices(indices_stats_file):
+            if index_name.startswith('.'):  # Skip system indices
+                continue
+            
+            primary_size = index_stats.get('primaries', {}).get('store', {}).get('size_in_bytes', np.nan)
+            sizes_records.append((index_name, None, 'primary', primary_size))
+            
+            for shard_id, shard_list in index_stats.get('shards', {}).items():
+                for shard in shard_list:
+                    if shard.get('routing', {}).get('primary', True) == False:
+                        replica_size = shard.get('store', {}).get('size_in_bytes', np.nan)
+                        sizes_records.append((index_name, shard_id, 'replica', replica_size))
         
-        # Create DataFrames for sizes
-        primary_sizes_df = pd.DataFrame(primary_sizes)
-        replica_sizes_df = pd.DataFrame(replica_sizes)
-        sizes_df = pd.concat([primary_sizes_df, replica_sizes_df])
-
-        # Convert size to numeric format
-        sizes_df['size_gb'] = sizes_df['size'].apply(
-            lambda x: bytes_to_gb(x) if isinstance(x, (int, float)) else x
-        )
+        # Create the DataFrame for sizes, typing size as numeric once (missing sizes are NaN)
+        sizes_df = pd.DataFrame.from_records(sizes_records, columns=['index', 'shard', 'data_type', 'size'])
+        sizes_df['size'] = pd.to_numeric(sizes_df['size'], errors='coerce')
+
+        # Convert size to GB
+        sizes_df['size_gb'] = bytes_to_gb(sizes_df['size'])
         
         # Calculate original data size (before indexing) using the 1.5 factor
-        # Only apply to primary shards - replicas are copies and don't represent original ingest
-        sizes_df['raw_data_size'] = sizes_df.apply(
-            lambda row: row['size'] / 1.5 if row['data_type'] == 'primary' and isinstance(row['size'], (int, float)) else'NA replica',
-            axis=1
-        )
+        # Only apply to primary shards - replicas are copies and don't represent original ingest (NaN)
+        is_primary = sizes_df['data_type'].to_numpy() == 'primary'
+        sizes_df['raw_data_size'] = np.where(is_primary, sizes_df['size'] / 1.5, np.nan)
         
-        sizes_df['raw_data_size_gb'] = sizes_df['raw_data_size'].apply(
-            lambda x: bytes_to_gb(x) if isinstance(x, (int, float)) else x
-        )
+        sizes_df['raw_data_size_gb'] = bytes_to_gb(sizes_df['raw_data_size'])
         
         # Process ilm_explain.json - extract ILM information
-        with open(ilm_explain_file, 'r') as f:
-            ilm_data = json.load(f)
-        
         ilm_list = []
         
-        for index_name, index_ilm in ilm_data.get('indices', {}).items():
+        for index_name, index_ilm in iter_json_indices(ilm_explain_file):
             if not index_name.startswith('.'):  # Skip system indices
                 ilm_list.append({
                     'index': index_name,
@@ -195,29 +229,19 @@ def process_elasticsearch_index_data(indices_stats_file, indices_file, nodes_fil
         ilm_df = pd.DataFrame(ilm_list)
         
         # Join all the DataFrames
+        # Index the lookup tables on their join keys so each join reuses the prebuilt index
+        nodes_df = nodes_df.set_index('id')  # Node ID in nodes.json
+        sizes_df = sizes_df[['index', 'data_type', 'size', 'size_gb', 'raw_data_size', 'raw_data_size_gb']].set_index(['index', 'data_type'])
+        ilm_df = ilm_df.set_index('index')
         
-        # First, join indices_df with nodes_df on node ID
-        result_df = indices_df.merge(
-            nodes_df,
-            left_on='id',  # Node ID in indices.json
-            right_on='id',  # Node ID in nodes.json
-            how='left'
-        )
-        
-        # Join with sizes information
-        # For this join, we need to use both index name and data_type
-        result_df = result_df.merge(
-            sizes_df,
-            left_on=['index', 'data_type'],
-            right_on=['index', 'data_type'],
-            how='left'
-        )
-        
-        # Finally, join with ILM information on index name
-        result_df = result_df.merge(
-            ilm_df,
-            on='index',  # Join on index name
-            how='left'
+        # Join indices_df with nodes on node ID, then sizes on both index name and data_type,
+        # and finally ILM information on index name
+        result_df = (
+            indices_df
+            .join(nodes_df, on='id', how='left')  # Node ID in indices.json
+            .join(sizes_df, on=['index', 'data_type'], how='left')
+            .join(ilm_df, on='index', how='left')
+            .reset_index(drop=True)
         )
         
         # 6. Clean up and select only the columns we need
@@ -239,15 +263,7 @@ def process_elasticsearch_index_data(indices_stats_file, indices_file, nodes_fil
         ]].rename(columns={'docs': 'docs_count'})
 
         # Round size values for better readability
-        if 'size_gb' in final_df.columns:
-            final_df['size_gb'] = final_df['size_gb'].apply(
-                lambda x: round(x, 2) if isinstance(x, (int, float)) else x
-            )
-        
-        if 'original_size_gb' in final_df.columns:
-            final_df['original_size_gb'] = final_df['original_size_gb'].apply(
-                lambda x: round(x, 2) if isinstance(x, (int, float)) else x
-            )
+        final_df['size_gb'] = final_df['size_gb'].round(2)
 
         return final_df
         
@@ -262,38 +278,24 @@ def calculate_pricing(processed_nodes_stat_data, processed_pricing_data):
     combined_df = processed_nodes_stat_data.merge(processed_pricing_data, on=['region_code', 'product'], how='left')
     
     # Create numeric versions of price columns for calculations
-    for col in ['standard', 'gold', 'platinum', 'enterprise']:
-        combined_df[f'{col}_numeric'] = combined_df[col].str.replace('$', '').astype(float)
+    tiers = ['standard', 'gold', 'platinum', 'enterprise']
+    prices = {tier: pd.to_numeric(combined_df[tier].str.lstrip('$'), errors='coerce').to_numpy() for tier in tiers}
 
     # Create a condition to identify rows that should have pricing calculated
-    # Check if any role contains 'data' and memory is >= 2GB
-    combined_df['should_calculate'] = combined_df.apply(
-        lambda row: any('data' in role.lower() for role in row['roles']) and row['memory (GB)'] >= 2, 
-        axis=1
-    )
-
-    # Initialize hourly and yearly columns with zeros
-    for col in ['standard/hr', 'gold/hr', 'platinum/hr', 'enterprise/hr', 
-                'standard/yr', 'gold/yr', 'platinum/yr', 'enterprise/yr']:
-        combined_df[col] = 0.0
-
-    # Calculate costs only for rows that meet the condition
-    mask = combined_df['should_calculate']
-    
-    # Calculate hourly costs
-    combined_df.loc[mask, 'standard/hr'] = combined_df.loc[mask, 'memory (GB)'] * combined_df.loc[mask, 'standard_numeric'] 
-    combined_df.loc[mask, 'gold/hr'] = combined_df.loc[mask, 'memory (GB)'] * combined_df.loc[mask, 'gold_numeric'] 
-    combined_df.loc[mask, 'platinum/hr'] = combined_df.loc[mask, 'memory (GB)'] * combined_df.loc[mask, 'platinum_numeric'] 
-    combined_df.loc[mask, 'enterprise/hr'] = combined_df.loc[mask, 'memory (GB)'] * combined_df.loc[mask, 'enterprise_numeric'] 
-    
-    # Calculate yearly costs (8760 hours in a year)
-    combined_df.loc[mask, 'standard/yr'] = combined_df.loc[mask, 'standard/hr'] * 8760
-    combined_df.loc[mask, 'gold/yr'] = combined_df.loc[mask, 'gold/hr'] * 8760
-    combined_df.loc[mask, 'platinum/yr'] = combined_df.loc[mask, 'platinum/hr'] * 8760
-    combined_df.loc[mask, 'enterprise/yr'] = combined_df.loc[mask, 'enterprise/hr'] * 8760
+    # Check if the node has a data role and memory is >= 2GB
+    has_data_role = combined_df['roles'].map(lambda roles: not DATA_ROLES.isdisjoint(roles or ()))
+    mask = has_data_role.to_numpy(dtype=bool) & (combined_df['memory (GB)'].to_numpy() >= 2)
 
-    # Drop the temporary columns
-    combined_df = combined_df.drop(['standard_numeric', 'gold_numeric', 'platinum_numeric', 'enterprise_numeric', 'should_calculate'], axis=1)
+    # Calculate hourly costs only for rows that meet the condition, zero otherwise
+    memory = combined_df['memory (GB)'].to_numpy()
+    hourly = {tier: np.where(mask, memory * prices[tier], 0.0) for tier in tiers}
+
+    for tier in tiers:
+        combined_df[f'{tier}/hr'] = hourly[tier]
+
+    # Calculate yearly costs (8760 hours in a year)
+    for tier in tiers:
+        combined_df[f'{tier}/yr'] = hourly[tier] * HOURS_PER_YEAR
     
     return combined_df
 
@@ -306,27 +308,21 @@ def calculate_index_costs(indices_df, nodes_pricing):
     # Create a unique identifier for each index
     merged_df['index_id'] = merged_df['index']
     
-    # Group by index and determine shard types
-    index_shards = merged_df.groupby('index')['data_type'].apply(list).reset_index()
-    index_shards['shard_type'] = index_shards['data_type'].apply(
-        lambda x: 'primary+replica' if set(x) == {'primary', 'replica'} else 'primary-only'
-    )
-    
-    # Group by index and calculate costs
-    index_costs = merged_df.groupby('index').agg({
-        'instance_configuration': 'first',  # Get the instance configuration
-        'size': 'sum',  # Sum the sizes of primary and replica shards
-        'standard/yr': 'sum',  # Sum the costs across shards
-        'gold/yr': 'sum',
-        'platinum/yr': 'sum',
-        'enterprise/yr': 'sum'
+    # Group by index and calculate costs and shard types in a single pass
+    index_costs = merged_df.groupby('index').agg(**{
+        'instance_configuration': ('instance_configuration', 'first'),  # Get the instance configuration
+        'size': ('size', 'sum'),  # Sum the sizes of primary and replica shards
+        'standard/yr': ('standard/yr', 'sum'),  # Sum the costs across shards
+        'gold/yr': ('gold/yr', 'sum'),
+        'platinum/yr': ('platinum/yr', 'sum'),
+        'enterprise/yr': ('enterprise/yr', 'sum'),
+        'data_types': ('data_type', 'nunique')  # Number of distinct shard types (primary/replica)
     }).reset_index()
     
-    # Add the shard type information
-    index_costs = index_costs.merge(index_shards[['index', 'shard_type']], on='index', how='left')
+    index_costs['shard_type'] = np.where(index_costs['data_types'] == 2, 'primary+replica', 'primary-only')
     
-    # Calculate size in MB
-    index_costs['total_index_size'] = index_costs['size']
+    # Calculate size in MB; keep the byte count integral so the CSV never shows it in scientific notation
+    index_costs['total_index_size'] = index_costs['size'].round().astype('Int64')
     index_costs['total_index_size (MB)'] = index_costs['size'] / (1024 * 1024)
     
     # Reorder and rename columns
@@ -385,7 +381,7 @@ def main():
 
     # Export the DataFrames to CSV files
     csv_file = current_dir / "elasticsearch_data.csv"
-    index_costs.to_csv(csv_file, index=False)
+    write_csv_file(index_costs, csv_file)
     print(f"\nData exported to: {csv_file}")
     
 
@@ -1,43 +1,149 @@
-import time
 import json
 import csv
 import argparse
+import concurrent.futures
+import functools
+import hashlib
+import logging
 import os
+import queue
+import re
+import sqlite3
+import threading
+import time
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException, StaleElementReferenceException
 from webdriver_manager.chrome import ChromeDriverManager
 
+logger = logging.getLogger(__name__)
+
+# Sentinel pushed onto the task queue once per worker to tell it to exit
+_STOP = "STOP"
+
+# Scraped pricing is reused from the on-disk cache for this long
+_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Requests that are irrelevant to the pricing table: analytics, web fonts and images
+_BLOCKED_URLS = [
+    "*google-analytics*",
+    "*googletagmanager*",
+    "*doubleclick*",
+    "*fullstory*",
+    "*.woff",
+    "*.woff2",
+    "*.png",
+    "*.jpg",
+    "*.gif",
+    "*.svg"
+]
+
+# Region labels look like "<flag> Name (region-code)", sometimes with a qualifier after the code
+_REGION_CODE_RE = re.compile(r'\(\s*([a-z0-9][a-z0-9-]*)\s*\)')
+
+# Locators used on every page load, built once
+_LABEL_XPATH = "//label[contains(text(), {!r})]"
+_TOGGLE_XPATH = (By.XPATH, "//span[contains(text(), 'Show deprecated SKUs')]/preceding-sibling::button")
+_LISTBOX_OPT = (By.CSS_SELECTOR, ".euiSuperSelect__listbox button[role='option']")
+_COOKIE_BUTTON = (By.CSS_SELECTOR, "button[data-test-id='acceptAllCookies']")
+_TABLE_ROWS = (By.CSS_SELECTOR, "table tbody tr")
+
+# Read the open dropdown's options in the browser with a single WebDriver round-trip
+_OPTIONS_DUMP_JS = f"""
+return [...document.querySelectorAll("{_LISTBOX_OPT[1]}")].map(
+    option => ({{id: option.id, text: option.innerText.trim()}}));
+"""
+
+# Read the pricing table's headers and cell text in the browser with a single WebDriver round-trip
+_TABLE_DUMP_JS = """
+const headers = [...document.querySelectorAll('table th')].map(th => th.innerText.trim());
+const rows = [...document.querySelectorAll('table tbody tr')].map(
+    tr => [...tr.querySelectorAll('td')].map(td => td.innerText.trim()));
+return {headers: headers, rows: rows};
+"""
+
+@functools.lru_cache(maxsize=None)
+def get_chromedriver_path():
+    # Resolve (and download if needed) chromedriver once per process, not once per worker
+    return ChromeDriverManager().install()
+
+def _make_driver(chrome_options):
+    return webdriver.Chrome(service=Service(get_chromedriver_path()), options=chrome_options)
+
+def open_pricing_cache(cache_file):
+    # Workers store results from their own threads, always under the CSV write lock
+    cache = sqlite3.connect(cache_file, check_same_thread=False)
+    cache.execute("CREATE TABLE IF NOT EXISTS pricing_cache (key TEXT PRIMARY KEY, ts INTEGER, json BLOB)")
+    return cache
+
+def pricing_cache_key(provider_id, region_id, with_deprecated):
+    return f"{provider_id}|{region_id}|{with_deprecated}"
+
+def get_cached_pricing(cache, key):
+    row = cache.execute(
+        "SELECT json FROM pricing_cache WHERE key = ? AND ts > ?",
+        (key, int(time.time()) - _CACHE_TTL_SECONDS)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+def store_cached_pricing(cache, key, pricing_data):
+    cache.execute(
+        "INSERT OR REPLACE INTO pricing_cache (key, ts, json) VALUES (?, ?, ?)",
+        (key, int(time.time()), json.dumps(pricing_data))
+    )
+    # Commit per region so an interrupted crawl keeps everything scraped so far
+    cache.commit()
+
 class ElasticCloudScraper:
-    def __init__(self, headless=False, timeout=20):
+    def __init__(self, headless=True, timeout=20, worker_id=0, debug=False):
         self.headless = headless
         self.timeout = timeout
+        # Screenshots and page source dumps are debugging aids only
+        self.debug = debug
+        # Parsed rows by (provider, table hash); many SKUs are priced the same in every region
+        self._table_cache = {}
         
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--mute-audio")
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
+        
+        # Keep a persistent profile and HTTP cache so page assets are reused across regions and runs.
+        # Chrome locks a profile while it is open, so every worker gets its own directory
+        chrome_options.add_argument(f"--user-data-dir={os.path.abspath(os.path.join('.chrome_profile', str(worker_id)))}")
+        chrome_options.add_argument(f"--disk-cache-dir={os.path.abspath(os.path.join('.chrome_cache', str(worker_id)))}")
+        chrome_options.add_argument("--disk-cache-size=536870912")
+        
+        # Return from driver.get once the DOM is interactive; callers wait for the elements they need
+        chrome_options.page_load_strategy = 'eager'
         
         try:
-            self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
-                options=chrome_options
-            )
+            self.driver = _make_driver(chrome_options)
             self.driver.set_page_load_timeout(self.timeout)
-            print("WebDriver initialized successfully")
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
+            self.driver.execute_cdp_cmd("Page.enable", {})
+            logger.debug("WebDriver initialized successfully")
         except Exception as e:
-            print(f"Error initializing WebDriver: {e}")
+            logger.error(f"Error initializing WebDriver: {e}")
             raise
 
     def navigate_to_main_page(self):
         url = "https://cloud.elastic.co/cloud-pricing-table"
-        print(f"Navigating to: {url}")
+        logger.debug(f"Navigating to: {url}")
         
         try:
             self.driver.get(url)
@@ -45,27 +151,29 @@ class ElasticCloudScraper:
             WebDriverWait(self.driver, self.timeout).until(
                 lambda d: "Elastic Cloud Pricing" in d.title
             )
-            print(f"Page loaded: {self.driver.current_url}")
+            logger.debug(f"Page loaded: {self.driver.current_url}")
             
             try:
                 cookie_button = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button[data-test-id='acceptAllCookies']"))
+                    EC.element_to_be_clickable(_COOKIE_BUTTON)
                 )
                 cookie_button.click()
-                print("Clicked cookie acceptance button")
-                time.sleep(1)
+                logger.debug("Clicked cookie acceptance button")
+                WebDriverWait(self.driver, 5).until(
+                    EC.invisibility_of_element_located(_COOKIE_BUTTON)
+                )
             except:
-                print("No cookie banner found or could not click it")
+                logger.debug("No cookie banner found or could not click it")
             
             return True
         except Exception as e:
-            print(f"Error navigating to main page: {e}")
+            logger.error(f"Error navigating to main page: {e}")
             return False
     
     def find_element_by_label(self, label_text):
         try:
             label = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, f"//label[contains(text(), '{label_text}')]"))
+                EC.presence_of_element_located((By.XPATH, _LABEL_XPATH.format(label_text)))
             )
             
             label_id = label.get_attribute("id")
@@ -80,17 +188,17 @@ class ElasticCloudScraper:
             button = form_row.find_element(By.CSS_SELECTOR, "button.euiSuperSelectControl")
             return button
         except Exception as e:
-            print(f"Error finding element with label '{label_text}': {e}")
+            logger.error(f"Error finding element with label '{label_text}': {e}")
             return None
     
     def find_deprecated_toggle(self):
         try:
             toggle = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//span[contains(text(), 'Show deprecated SKUs')]/preceding-sibling::button"))
+                EC.presence_of_element_located(_TOGGLE_XPATH)
             )
             return toggle
         except Exception as e:
-            print(f"Error finding 'Show deprecated SKUs' toggle: {e}")
+            logger.debug(f"Error finding 'Show deprecated SKUs' toggle, trying switch labels: {e}")
             try:
                 switches = self.driver.find_elements(By.CSS_SELECTOR, ".euiSwitch__button")
                 for switch in switches:
@@ -102,6 +210,24 @@ class ElasticCloudScraper:
                 pass
             return None
     
+    def wait_for_dropdown_options(self):
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located(_LISTBOX_OPT)
+        )
+    
+    def get_table_signature(self):
+        # Row count catches rows being added or removed, the first row catches a different table
+        rows = self.driver.find_elements(*_TABLE_ROWS)
+        return (len(rows), rows[0].text if rows else None)
+    
+    def wait_for_table_change(self, previous_signature):
+        try:
+            WebDriverWait(self.driver, 10, ignored_exceptions=[StaleElementReferenceException]).until(
+                lambda d: self.get_table_signature() != previous_signature
+            )
+        except TimeoutException:
+            logger.warning("Pricing table did not change after selection, continuing")
+    
     def get_cloud_providers(self):
         providers = []
         
@@ -109,44 +235,43 @@ class ElasticCloudScraper:
             provider_dropdown = self.find_element_by_label("Cloud provider")
             
             if not provider_dropdown:
-                print("Could not find Cloud Provider dropdown")
+                logger.warning("Could not find Cloud Provider dropdown")
                 return []
             
             current_provider_text = provider_dropdown.text.strip()
-            print(f"Current selected provider: {current_provider_text}")
+            logger.debug(f"Current selected provider: {current_provider_text}")
             
-            self.driver.save_screenshot("before_provider_click.png")
-            print("Screenshot saved to before_provider_click.png")
+            if self.debug:
+                self.driver.save_screenshot("before_provider_click.png")
+                logger.debug("Screenshot saved to before_provider_click.png")
             
             provider_dropdown.click()
-            print("Clicked cloud provider dropdown")
+            logger.debug("Clicked cloud provider dropdown")
             
-            time.sleep(2)
+            self.wait_for_dropdown_options()
             
-            self.driver.save_screenshot("after_provider_click.png")
-            print("Screenshot saved to after_provider_click.png")
+            if self.debug:
+                self.driver.save_screenshot("after_provider_click.png")
+                logger.debug("Screenshot saved to after_provider_click.png")
             
-            provider_options = self.driver.find_elements(By.CSS_SELECTOR, ".euiSuperSelect__listbox button[role='option']")
-            print(f"Found {len(provider_options)} provider options")
+            provider_options = self.driver.execute_script(_OPTIONS_DUMP_JS)
+            logger.debug(f"Found {len(provider_options)} provider options")
             
-            with open("provider_dropdown_source.html", "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
-            print("Saved provider dropdown HTML to provider_dropdown_source.html")
+            if self.debug:
+                with open("provider_dropdown_source.html", "w", encoding="utf-8") as f:
+                    f.write(self.driver.page_source)
+                logger.debug("Saved provider dropdown HTML to provider_dropdown_source.html")
             
             for option in provider_options:
-                try:
-                    provider_id = option.get_attribute("id")
-                    
-                    provider_text = option.text.strip()
-                    
-                    if provider_id and provider_text:
-                        providers.append({
-                            "id": provider_id,
-                            "name": provider_text
-                        })
-                        print(f"Found provider: {provider_id} - {provider_text}")
-                except Exception as e:
-                    print(f"Error processing provider option: {e}")
+                provider_id = option["id"]
+                provider_text = option["text"]
+                
+                if provider_id and provider_text:
+                    providers.append({
+                        "id": provider_id,
+                        "name": provider_text
+                    })
+                    logger.debug(f"Found provider: {provider_id} - {provider_text}")
             
             try:
                 self.driver.find_element(By.TAG_NAME, "body").click()
@@ -155,9 +280,7 @@ class ElasticCloudScraper:
             
             return providers
         except Exception as e:
-            print(f"Error getting cloud providers: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error getting cloud providers: {e}")
             return []
     
     def select_provider(self, provider_id):
@@ -165,24 +288,29 @@ class ElasticCloudScraper:
             provider_dropdown = self.find_element_by_label("Cloud provider")
             
             if not provider_dropdown:
-                print(f"Could not find Cloud Provider dropdown to select {provider_id}")
+                logger.warning(f"Could not find Cloud Provider dropdown to select {provider_id}")
                 return False
             
             current_provider_text = provider_dropdown.text.strip()
-            print(f"Current provider: {current_provider_text}")
+            logger.debug(f"Current provider: {current_provider_text}")
+            
+            previous_signature = self.get_table_signature()
             
             provider_dropdown.click()
-            print("Clicked provider dropdown")
-            time.sleep(2)
+            logger.debug("Clicked provider dropdown")
+            self.wait_for_dropdown_options()
             
             provider_option = self.driver.find_element(By.CSS_SELECTOR, f"button[id='{provider_id}']")
+            already_selected = provider_option.get_attribute("aria-selected") == "true"
             provider_option.click()
-            print(f"Selected provider: {provider_id}")
-            time.sleep(3)
+            logger.debug(f"Selected provider: {provider_id}")
+            
+            if not already_selected:
+                self.wait_for_table_change(previous_signature)
             
             return True
         except Exception as e:
-            print(f"Error selecting provider {provider_id}: {e}")
+            logger.error(f"Error selecting provider {provider_id}: {e}")
             return False
     
     def get_regions_for_current_provider(self):
@@ -192,53 +320,53 @@ class ElasticCloudScraper:
             region_dropdown = self.find_element_by_label("Region")
             
             if not region_dropdown:
-                print("Could not find Region dropdown")
+                logger.warning("Could not find Region dropdown")
                 return []
             
             current_region_text = region_dropdown.text.strip()
-            print(f"Current selected region: {current_region_text}")
+            logger.debug(f"Current selected region: {current_region_text}")
             
-            self.driver.save_screenshot("before_region_click.png")
-            print("Screenshot saved to before_region_click.png")
+            if self.debug:
+                self.driver.save_screenshot("before_region_click.png")
+                logger.debug("Screenshot saved to before_region_click.png")
             
             region_dropdown.click()
-            print("Clicked region dropdown")
+            logger.debug("Clicked region dropdown")
             
-            time.sleep(2)
+            self.wait_for_dropdown_options()
             
-            self.driver.save_screenshot("after_region_click.png")
-            print("Screenshot saved to after_region_click.png")
+            if self.debug:
+                self.driver.save_screenshot("after_region_click.png")
+                logger.debug("Screenshot saved to after_region_click.png")
             
-            region_options = self.driver.find_elements(By.CSS_SELECTOR, ".euiSuperSelect__listbox button[role='option']")
-            print(f"Found {len(region_options)} region options")
+            region_options = self.driver.execute_script(_OPTIONS_DUMP_JS)
+            logger.debug(f"Found {len(region_options)} region options")
             
-            with open("region_dropdown_source.html", "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
-            print("Saved region dropdown HTML to region_dropdown_source.html")
+            if self.debug:
+                with open("region_dropdown_source.html", "w", encoding="utf-8") as f:
+                    f.write(self.driver.page_source)
+                logger.debug("Saved region dropdown HTML to region_dropdown_source.html")
             
             current_url = self.driver.current_url
             provider_param = current_url.split("provider=")[1].split("&")[0] if "provider=" in current_url else None
             
             for option in region_options:
                 try:
-                    region_id = option.get_attribute("id")
+                    region_id = option["id"]
                     
-                    region_text = option.text.strip()
+                    region_text = option["text"]
                     
                     region_name = region_text
                     region_code = ""
                     
-                    if "(" in region_text and ")" in region_text:
-                        region_code = region_text.split("(")[1].split(")")[0].strip()
-                        name_part = region_text.split("(")[0].strip()
-                        
-                        if len(name_part) > 3:
-                            start_idx = 0
-                            for i in range(len(name_part)):
-                                if name_part[i].isalpha():
-                                    start_idx = i
-                                    break
-                            region_name = name_part[start_idx:].strip()
+                    # The code is the first group that looks like one, the name is whatever precedes it
+                    match = _REGION_CODE_RE.search(region_text)
+                    if match:
+                        region_code = match.group(1)
+                        # Drop the leading flag emoji, the name starts at the first letter
+                        name_part = region_text[:match.start()]
+                        start_idx = next((i for i, ch in enumerate(name_part) if ch.isalpha()), len(name_part))
+                        region_name = name_part[start_idx:].strip() or region_text
                     
                     url = f"https://cloud.elastic.co/cloud-pricing-table?productType=stack_hosted&provider={provider_param}&region={region_id}"
                     
@@ -250,9 +378,9 @@ class ElasticCloudScraper:
                         "url": url
                     })
                     
-                    print(f"Found region: {region_name} (ID: {region_id})")
+                    logger.debug(f"Found region: {region_name} (ID: {region_id})")
                 except Exception as e:
-                    print(f"Error processing region option: {e}")
+                    logger.error(f"Error processing region option: {e}")
             
             try:
                 self.driver.find_element(By.TAG_NAME, "body").click()
@@ -261,34 +389,23 @@ class ElasticCloudScraper:
             
             return regions
         except Exception as e:
-            print(f"Error getting regions: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error getting regions: {e}")
             return []
     
-    def select_region(self, region_id):
+    def open_region(self, url):
         try:
-            region_dropdown = self.find_element_by_label("Region")
-            
-            if not region_dropdown:
-                print(f"Could not find Region dropdown to select {region_id}")
-                return False
-            
-            current_region_text = region_dropdown.text.strip()
-            print(f"Current region: {current_region_text}")
-            
-            region_dropdown.click()
-            print("Clicked region dropdown")
-            time.sleep(2)
-            
-            region_option = self.driver.find_element(By.CSS_SELECTOR, f"button[id='{region_id}']")
-            region_option.click()
-            print(f"Selected region: {region_id}")
-            time.sleep(3)
+            # Navigate over CDP rather than the WebDriver protocol; the command returns before
+            # the new document replaces the old one, so wait for the old one to go stale first
+            previous_page = self.driver.find_element(By.TAG_NAME, "html")
+            self.driver.execute_cdp_cmd("Page.navigate", {"url": url})
             
+            WebDriverWait(self.driver, self.timeout).until(EC.staleness_of(previous_page))
+            WebDriverWait(self.driver, self.timeout).until(
+                EC.presence_of_element_located(_TABLE_ROWS)
+            )
             return True
         except Exception as e:
-            print(f"Error selecting region {region_id}: {e}")
+            logger.error(f"Error opening region page {url}: {e}")
             return False
     
     def toggle_deprecated_skus(self, show=True):
@@ -296,22 +413,32 @@ class ElasticCloudScraper:
             toggle = self.find_deprecated_toggle()
             
             if not toggle:
-                print("Could not find 'Show deprecated SKUs' toggle")
+                logger.warning("Could not find 'Show deprecated SKUs' toggle")
                 return False
             
             is_checked = toggle.get_attribute("aria-checked") == "true"
-            print(f"Current 'Show deprecated SKUs' state: {is_checked}")
+            logger.debug(f"Current 'Show deprecated SKUs' state: {is_checked}")
             
             if (show and not is_checked) or (not show and is_checked):
+                previous_rows = len(self.driver.find_elements(*_TABLE_ROWS))
                 toggle.click()
-                print(f"Toggled 'Show deprecated SKUs' to {show}")
-                time.sleep(2)
+                logger.debug(f"Toggled 'Show deprecated SKUs' to {show}")
+                WebDriverWait(self.driver, 10).until(
+                    lambda d: (toggle.get_attribute("aria-checked") == "true") == show
+                )
+                # Give the deprecated rows a moment to render; many regions have none
+                try:
+                    WebDriverWait(self.driver, 1).until(
+                        lambda d: len(d.find_elements(*_TABLE_ROWS)) != previous_rows
+                    )
+                except TimeoutException:
+                    logger.debug("Row count unchanged after toggling 'Show deprecated SKUs'")
             else:
-                print(f"'Show deprecated SKUs' already set to {show}")
+                logger.debug(f"'Show deprecated SKUs' already set to {show}")
             
             return True
         except Exception as e:
-            print(f"Error toggling 'Show deprecated SKUs': {e}")
+            logger.error(f"Error toggling 'Show deprecated SKUs': {e}")
             return False
     
     def extract_pricing_table(self, provider_name, region_name, region_code):
@@ -320,63 +447,169 @@ class ElasticCloudScraper:
                 EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
             )
             
-            self.driver.save_screenshot(f"pricing_table_{provider_name}_{region_name}.png")
+            if self.debug:
+                self.driver.save_screenshot(f"pricing_table_{provider_name}_{region_name}.png")
             
-            headers = []
-            header_elements = self.driver.find_elements(By.CSS_SELECTOR, "table th")
+            table = self.driver.execute_script(_TABLE_DUMP_JS)
             
-            if not header_elements:
-                print("No table headers found")
+            if not table["headers"]:
+                logger.warning("No table headers found")
                 return []
             
-            for header in header_elements:
-                headers.append(header.text.strip())
+            table_hash = hashlib.blake2b(json.dumps(table).encode(), digest_size=8).hexdigest()
+            cached_rows = self._table_cache.get((provider_name, table_hash))
+            if cached_rows is not None:
+                logger.debug(f"Pricing table unchanged from an earlier {provider_name} region, reusing {len(cached_rows)} entries")
+                return [dict(row, region=region_name, region_code=region_code) for row in cached_rows]
             
             pricing_data = []
-            row_elements = self.driver.find_elements(By.CSS_SELECTOR, "table tbody tr")
             
-            for row in row_elements:
+            for cells in table["rows"]:
                 row_data = {
                     "cloud_provider": provider_name,
                     "region": region_name,
                     "region_code": region_code
                 }
                 
-                cells = row.find_elements(By.TAG_NAME, "td")
-                
                 if not cells:
                     continue
                 
-                row_data["product"] = cells[0].text.strip()
+                row_data["product"] = cells[0]
                 
                 tiers = ["standard", "gold", "platinum", "enterprise"]
                 for i, tier in enumerate(tiers):
                     cell_index = i + 1
                     if cell_index < len(cells) - 1:
-                        row_data[tier] = cells[cell_index].text.strip()
+                        row_data[tier] = cells[cell_index]
                     else:
                         row_data[tier] = ""
                 
                 if len(cells) > 1:
-                    row_data["unit"] = cells[-1].text.strip()
+                    row_data["unit"] = cells[-1]
                 else:
                     row_data["unit"] = ""
                 
                 pricing_data.append(row_data)
             
-            print(f"Extracted {len(pricing_data)} pricing entries")
+            self._table_cache[(provider_name, table_hash)] = pricing_data
+            logger.debug(f"Extracted {len(pricing_data)} pricing entries")
             return pricing_data
         except Exception as e:
-            print(f"Error extracting pricing table: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error extracting pricing table: {e}")
             return []
     
-    def discover_all_pricing(self, with_deprecated=True, output_csv="elastic_pricing.csv"):
+    def scrape_tasks(self, task_queue, with_deprecated, writer, write_lock, all_pricing_data, cache):
+        # Load the main page once per browser to get past the cookie banner
+        if not self.navigate_to_main_page():
+            logger.warning("Worker failed to load the main page")
+            return
+        
+        while True:
+            task = task_queue.get()
+            
+            if task == _STOP:
+                break
+            
+            provider, region = task
+            provider_name = provider["name"]
+            region_id = region["id"]
+            region_name = region["name"]
+            region_code = region["code"] if "code" in region else ""
+            
+            logger.info(f"Extracting pricing for {provider_name} - {region_name} ({region_id})...")
+            
+            if not self.open_region(region["url"]):
+                logger.warning(f"Failed to open region {region_id}, skipping...")
+                continue
+            
+            # The deprecated SKU switch is page state, so re-apply it after each load
+            self.toggle_deprecated_skus(with_deprecated)
+            
+            pricing_data = self.extract_pricing_table(provider_name, region_name, region_code)
+            
+            with write_lock:
+                writer.writerows(pricing_data)
+                all_pricing_data.extend(pricing_data)
+                
+                if pricing_data:
+                    store_cached_pricing(cache, pricing_cache_key(provider["id"], region_id, with_deprecated), pricing_data)
+            
+            logger.info(f"Wrote {len(pricing_data)} entries for {provider_name} - {region_name}")
+    
+    def enumerate_regions(self, provider):
+        provider_id = provider["id"]
+        provider_name = provider["name"]
+        
+        logger.info(f"Discovering regions for {provider_name} ({provider_id})...")
+        
+        # Fresh workers have not loaded the pricing page yet
+        if "cloud-pricing-table" not in self.driver.current_url and not self.navigate_to_main_page():
+            logger.warning(f"Failed to load the main page, skipping {provider_id}...")
+            return []
+        
+        if not self.select_provider(provider_id):
+            logger.warning(f"Failed to select provider {provider_id}, skipping...")
+            return []
+        
+        return [(provider, region) for region in self.get_regions_for_current_provider()]
+    
+    def start_workers(self, scrapers, count):
+        # Grow the pool of drivers to count; this scraper is always the first worker
+        try:
+            for worker_id in range(len(scrapers), count):
+                scrapers.append(ElasticCloudScraper(
+                    headless=self.headless, timeout=self.timeout, worker_id=worker_id, debug=self.debug
+                ))
+        except Exception as e:
+            logger.warning(f"Could not start all workers, continuing with {len(scrapers)}: {e}")
+    
+    def enumerate_all_regions(self, providers, scrapers):
+        # Each provider needs its own dropdown selection, so enumerate them concurrently,
+        # checking an idle driver out of the pool for each provider
+        idle_scrapers = queue.Queue()
+        for scraper in scrapers:
+            idle_scrapers.put(scraper)
+        
+        def enumerate_with_idle_scraper(provider):
+            scraper = idle_scrapers.get()
+            try:
+                return scraper.enumerate_regions(provider)
+            finally:
+                idle_scrapers.put(scraper)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+            return [task for tasks in executor.map(enumerate_with_idle_scraper, providers) for task in tasks]
+    
+    def scrape_with_workers(self, tasks, scrapers, with_deprecated, writer, write_lock, all_pricing_data, cache):
+        # Each region is an independent page, so spread them over the pool of drivers
+        logger.info(f"Scraping {len(tasks)} regions with {len(scrapers)} workers")
+        
+        task_queue = queue.Queue()
+        for task in tasks:
+            task_queue.put(task)
+        for _ in scrapers:
+            task_queue.put(_STOP)
+        
+        threads = [
+            threading.Thread(
+                target=scraper.scrape_tasks,
+                args=(task_queue, with_deprecated, writer, write_lock, all_pricing_data, cache)
+            )
+            for scraper in scrapers
+        ]
+        
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    
+    def discover_all_pricing(self, with_deprecated=True, output_csv="elastic_pricing.csv", workers=None,
+                             cache_file="scrape_cache.db", force_rescrape=False):
         all_pricing_data = []
+        workers = max(1, workers or os.cpu_count() or 1)
         
         if not self.navigate_to_main_page():
-            print("Failed to load the main page")
+            logger.warning("Failed to load the main page")
             return all_pricing_data
         
         self.toggle_deprecated_skus(with_deprecated)
@@ -384,46 +617,52 @@ class ElasticCloudScraper:
         providers = self.get_cloud_providers()
         
         if not providers:
-            print("No providers found")
+            logger.warning("No providers found")
             return all_pricing_data
         
-        with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['cloud_provider', 'region', 'region_code', 'product', 'standard', 'gold', 'platinum', 'enterprise', 'unit']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for provider in providers:
-                provider_id = provider["id"]
-                provider_name = provider["name"]
-                
-                print(f"\nDiscovering regions for {provider_name} ({provider_id})...")
-                
-                if not self.select_provider(provider_id):
-                    print(f"Failed to select provider {provider_id}, skipping...")
-                    continue
+        scrapers = [self]
+        cache = None
+        try:
+            # Enumerate every (provider, region) pair, one provider per driver
+            self.start_workers(scrapers, min(workers, len(providers)))
+            tasks = self.enumerate_all_regions(providers, scrapers)
+            
+            cache = open_pricing_cache(cache_file)
+            
+            with open(output_csv, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                fieldnames = ['cloud_provider', 'region', 'region_code', 'product', 'standard', 'gold', 'platinum', 'enterprise', 'unit']
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer.writeheader()
+                write_lock = threading.Lock()
                 
-                regions = self.get_regions_for_current_provider()
+                # Emit regions scraped within the cache TTL straight from the cache
+                pending_tasks = []
                 
-                for region in regions:
-                    region_id = region["id"]
-                    region_name = region["name"]
-                    region_code = region["code"] if "code" in region else ""
+                for provider, region in tasks:
+                    cached = None
+                    if not force_rescrape:
+                        cached = get_cached_pricing(cache, pricing_cache_key(provider["id"], region["id"], with_deprecated))
                     
-                    print(f"\nExtracting pricing for {provider_name} - {region_name} ({region_id})...")
-                    
-                    if not self.select_region(region_id):
-                        print(f"Failed to select region {region_id}, skipping...")
+                    if cached is None:
+                        pending_tasks.append((provider, region))
                         continue
                     
-                    pricing_data = self.extract_pricing_table(provider_name, region_name, region_code)
-                    
-                    for item in pricing_data:
-                        writer.writerow(item)
-                        all_pricing_data.append(item)
-                    
-                    print(f"Wrote {len(pricing_data)} entries for {provider_name} - {region_name}")
+                    writer.writerows(cached)
+                    all_pricing_data.extend(cached)
+                    logger.info(f"Used {len(cached)} cached entries for {provider['name']} - {region['name']}")
+                
+                if pending_tasks:
+                    self.start_workers(scrapers, min(workers, len(pending_tasks)))
+                    self.scrape_with_workers(
+                        pending_tasks, scrapers[:len(pending_tasks)], with_deprecated, writer, write_lock, all_pricing_data, cache
+                    )
+        finally:
+            if cache is not None:
+                cache.close()
+            for scraper in scrapers[1:]:
+                scraper.close()
         
-        print(f"Total pricing entries: {len(all_pricing_data)}")
+        logger.info(f"Total pricing entries: {len(all_pricing_data)}")
         return all_pricing_data
     
     def close(self):
@@ -434,28 +673,39 @@ def main():
     parser = argparse.ArgumentParser(description='Elastic Cloud Price Scraper')
     parser.add_argument('--output', type=str, default='elastic_pricing.csv', 
                        help='Output CSV file (default: elastic_pricing.csv)')
-    parser.add_argument('--headless', action='store_true', 
-                       help='Run in headless mode (default: false, shows browser)')
+    parser.add_argument('--no-headless', action='store_true', 
+                       help='Show the browser window (default: run headless)')
     parser.add_argument('--no-deprecated', action='store_true',
                        help='Do not show deprecated SKUs (default: show deprecated SKUs)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Number of browser instances scraping in parallel (default: number of CPUs)')
+    parser.add_argument('--force-rescrape', action='store_true',
+                       help='Ignore pricing cached in scrape_cache.db within the last 24 hours')
+    parser.add_argument('--debug', action='store_true',
+                       help='Log every step and save screenshots and page source (default: false)')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.debug:
+        # Only this module goes to DEBUG, selenium/urllib3 stay at INFO
+        logger.setLevel(logging.DEBUG)
+    
     scraper = None
     try:
-        print("Starting Elastic Cloud price scraping...")
-        scraper = ElasticCloudScraper(headless=args.headless)
+        logger.info("Starting Elastic Cloud price scraping...")
+        scraper = ElasticCloudScraper(headless=not args.no_headless, debug=args.debug)
         pricing_data = scraper.discover_all_pricing(
             with_deprecated=not args.no_deprecated,
-            output_csv=args.output
+            output_csv=args.output,
+            workers=args.workers,
+            force_rescrape=args.force_rescrape
         )
         
-        print(f"\nScraping completed. Extracted {len(pricing_data)} pricing entries.")
-        print(f"Data saved to {args.output}")
+        logger.info(f"Scraping completed. Extracted {len(pricing_data)} pricing entries.")
+        logger.info(f"Data saved to {args.output}")
     except Exception as e:
-        print(f"An error occurred during scraping: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"An error occurred during scraping: {e}")
     finally:
         if scraper:
             scraper.close()